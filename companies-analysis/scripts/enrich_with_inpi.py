@@ -4,12 +4,15 @@ Script pour enrichir la base de données avec les données financières INPI (GR
 
 Usage:
     python scripts/enrich_with_inpi.py
+    python scripts/enrich_with_inpi.py --max-age-days 30   # Ré-interroge les SIREN enrichis il y a plus de 30 jours
+    python scripts/enrich_with_inpi.py --refresh   # Ré-interroge aussi les SIREN déjà enrichis
 """
 
 import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
 import sqlite3
 import json
 from dotenv import load_dotenv
@@ -23,6 +26,22 @@ logger.add(sys.stderr, level="INFO")
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Enrichir le cache Pappers avec les données financières INPI"
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help="Ré-interroger l'API INPI pour les SIREN déjà présents dans inpi_financials"
+    )
+    parser.add_argument(
+        '--max-age-days',
+        type=int,
+        default=90,
+        help="Âge max (jours) d'un enrichissement avant de ré-interroger l'INPI (défaut: 90)"
+    )
+    args = parser.parse_args()
+
     load_dotenv()
 
     print("=" * 80)
@@ -40,11 +59,50 @@ def main():
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    # Créer une table pour stocker les données INPI si elle n'existe pas
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS inpi_financials (
+            siren TEXT PRIMARY KEY,
+            exercice_date TEXT,
+            date_depot TEXT,
+            chiffre_affaires REAL,
+            resultat_net REAL,
+            capitaux_propres REAL,
+            immobilisations REAL,
+            dettes REAL,
+            effectif INTEGER,
+            marge_pct REAL,
+            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (siren) REFERENCES entreprises(siren)
+        )
+    """)
+
     # Récupérer tous les SIREN
     cursor.execute("SELECT siren FROM entreprises")
     sirens = [row[0] for row in cursor.fetchall()]
 
     logger.info(f"📊 Found {len(sirens)} companies in cache")
+
+    # Seul le dernier bilan est stocké et un nouveau est déposé chaque année :
+    # on ne ré-interroge l'API que pour les enrichissements plus vieux que max_age_days
+    if args.refresh:
+        sirens_to_fetch = sirens
+    else:
+        cursor.execute("""
+            SELECT siren FROM entreprises
+            WHERE siren NOT IN (
+                SELECT siren FROM inpi_financials
+                WHERE fetched_at > datetime('now', ?)
+            )
+        """, (f"-{args.max_age_days} days",))
+        sirens_to_fetch = [row[0] for row in cursor.fetchall()]
+
+        recently_enriched = len(sirens) - len(sirens_to_fetch)
+        if recently_enriched:
+            logger.info(
+                f"⏭️  {recently_enriched} companies enriched less than {args.max_age_days} days ago, "
+                f"skipping (use --refresh to re-fetch)"
+            )
     print()
 
     # Initialiser le client INPI
@@ -64,34 +122,11 @@ def main():
     print("🔍 Enrichissement en cours (GRATUIT - 0€)...")
     print("-" * 80)
 
-    enriched_data = inpi_client.enrich_companies_batch(sirens)
+    enriched_data = inpi_client.enrich_companies_batch(sirens_to_fetch) if sirens_to_fetch else {}
 
-    # Créer une table pour stocker les données INPI si elle n'existe pas
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS inpi_financials (
-            siren TEXT PRIMARY KEY,
-            exercice_date TEXT,
-            date_depot TEXT,
-            chiffre_affaires REAL,
-            resultat_net REAL,
-            capitaux_propres REAL,
-            immobilisations REAL,
-            dettes REAL,
-            effectif INTEGER,
-            marge_pct REAL,
-            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (siren) REFERENCES entreprises(siren)
-        )
-    """)
-
-    # Sauvegarder les données enrichies
-    for siren, financial_data in enriched_data.items():
-        cursor.execute("""
-            INSERT OR REPLACE INTO inpi_financials (
-                siren, exercice_date, date_depot, chiffre_affaires, resultat_net,
-                capitaux_propres, immobilisations, dettes, effectif, marge_pct
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    # Sauvegarder les données enrichies (une seule requête préparée pour tout le lot)
+    rows = [
+        (
             siren,
             financial_data.get('exercice_date'),
             financial_data.get('date_depot'),
@@ -102,7 +137,16 @@ def main():
             financial_data.get('dettes'),
             financial_data.get('effectif'),
             financial_data.get('marge_pct')
-        ))
+        )
+        for siren, financial_data in enriched_data.items()
+    ]
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO inpi_financials (
+            siren, exercice_date, date_depot, chiffre_affaires, resultat_net,
+            capitaux_propres, immobilisations, dettes, effectif, marge_pct
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
 
     conn.commit()
 
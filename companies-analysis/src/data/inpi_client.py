@@ -6,10 +6,12 @@ API: https://registre-national-entreprises.inpi.fr/api/companies/{siren}
 """
 
 import os
+import time
 import requests
 from typing import Dict, Optional, List
 from loguru import logger
 from datetime import datetime
+from .json_utils import parse_json_response
 
 
 class INPIClient:
@@ -34,6 +36,10 @@ class INPIClient:
         self.base_url = "https://registre-national-entreprises.inpi.fr/api"
         self.session = requests.Session()
 
+        # Rate limiting - respecter les limites de l'API
+        self.last_request_time = 0
+        self.min_request_interval = 0.5  # 2 requêtes/seconde max
+
         if self.api_key:
             self.session.headers.update({
                 'Authorization': f'Bearer {self.api_key}',
@@ -43,6 +49,13 @@ class INPIClient:
         else:
             logger.warning("INPI_API_KEY not found - API calls may be limited")
 
+    def _wait_for_rate_limit(self):
+        """Attend pour respecter le rate limiting"""
+        elapsed = time.time() - self.last_request_time
+        if elapsed < self.min_request_interval:
+            time.sleep(self.min_request_interval - elapsed)
+        self.last_request_time = time.time()
+
     def get_company_info(self, siren: str) -> Optional[Dict]:
         """
         Récupère les informations d'entreprise depuis l'API INPI
@@ -55,11 +68,12 @@ class INPIClient:
         """
         try:
             url = f"{self.base_url}/companies/{siren}"
+            self._wait_for_rate_limit()
             response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
                 logger.debug(f"✅ INPI data retrieved for {siren}")
-                return response.json()
+                return parse_json_response(response)
             elif response.status_code == 404:
                 logger.debug(f"❌ No INPI data for {siren}")
                 return None
@@ -83,10 +97,11 @@ class INPIClient:
         """
         try:
             url = f"{self.base_url}/companies/{siren}/attachments"
+            self._wait_for_rate_limit()
             response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json_response(response)
 
                 # Chercher le dernier bilan comptable
                 bilans = [
@@ -183,10 +198,6 @@ class INPIClient:
             if financial_data:
                 results[siren] = financial_data
 
-            # Rate limiting - respecter les limites de l'API
-            import time
-            time.sleep(0.5)  # 2 requêtes/seconde max
-
         logger.info(
             f"✅ INPI enrichment complete: {len(results)}/{len(sirens)} "
             f"companies enriched ({len(results)/len(sirens)*100:.1f}%)"
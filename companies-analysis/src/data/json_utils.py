@@ -0,0 +1,33 @@
+"""
+Décodage JSON des réponses HTTP, partagé par les clients API
+"""
+
+from typing import Dict
+
+import requests
+
+try:
+    import orjson  # Décodage JSON plus rapide (optionnel)
+except ImportError:
+    orjson = None
+
+
+def parse_json_response(response: requests.Response) -> Dict:
+    """
+    Décode la réponse JSON (orjson si disponible)
+
+    Args:
+        response: Réponse HTTP
+
+    Returns:
+        Contenu JSON décodé
+
+    Raises:
+        requests.exceptions.JSONDecodeError: Si le corps n'est pas du JSON valide
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # response.json() lève l'erreur habituelle de requests
+    return response.json()
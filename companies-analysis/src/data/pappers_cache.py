@@ -8,7 +8,7 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from loguru import logger
 
 
@@ -107,6 +107,41 @@ class PappersCache:
 
             return None
 
+    def get_entreprises(self, sirens: List[str]) -> Dict[str, Dict]:
+        """
+        Récupère plusieurs entreprises du cache en une seule requête par lot
+
+        Args:
+            sirens: Numéros SIREN
+
+        Returns:
+            Dict {siren: données} pour les entreprises en cache et valides
+        """
+        results = {}
+        now = datetime.now()
+
+        with sqlite3.connect(self.db_path) as conn:
+            # Lots de 500 pour rester sous la limite de paramètres SQLite
+            for i in range(0, len(sirens), 500):
+                batch = sirens[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor = conn.execute(
+                    f"""
+                    SELECT siren, data, fetched_at
+                    FROM entreprises
+                    WHERE siren IN ({placeholders})
+                """,
+                    batch,
+                )
+
+                for siren, data_json, fetched_at in cursor.fetchall():
+                    # Les entrées expirées sont ignorées (purgées par get_entreprise)
+                    if now - datetime.fromisoformat(fetched_at) < self.cache_ttl:
+                        results[siren] = json.loads(data_json)
+
+        logger.debug(f"Cache HIT for {len(results)}/{len(sirens)} SIREN")
+        return results
+
     def set_entreprise(self, siren: str, data: Dict):
         """
         Stocke une entreprise dans le cache
@@ -4,12 +4,62 @@ Permet de récupérer les données d'entreprises françaises
 """
 
 import os
+import random
+import re
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from loguru import logger
 from datetime import datetime
 from .pappers_cache import PappersCache
+from .json_utils import parse_json_response
+
+
+# Tranches d'effectif Pappers -> nombre d'employés retenu (milieu de tranche)
+# Testées dans l'ordre : le premier libellé trouvé l'emporte
+TRANCHES_EFFECTIF = (
+    (('entre 1 et 2', '1 ou 2'), 2),
+    (('entre 3 et 5', '3 à 5'), 4),
+    (('entre 6 et 9', '6 à 9'), 8),
+    (('entre 10 et 19', '10 à 19'), 15),
+    (('entre 20 et 49', '20 à 49'), 35),
+    (('entre 50 et 99', '50 à 99'), 75),
+    (('entre 100 et 199', '100 à 199'), 150),
+    (('entre 200 et 249', '200 à 249'), 225),
+    (('entre 250 et 499', '250 à 499'), 375),
+    (('entre 500 et 999', '500 à 999'), 750),
+    (('au moins 1 salarié', 'au moins 1'), 1),
+    (('2000', 'plus de'), 2000),  # Grande entreprise
+)
+
+_NOMBRE_RE = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=256)
+def _parse_tranche_effectif(effectif_str: str) -> int:
+    """
+    Convertit un libellé d'effectif en nombre d'employés
+
+    Pappers ne renvoie qu'une poignée de libellés distincts : le résultat
+    est mémoïsé pour ne parcourir la table qu'une fois par libellé.
+    """
+    effectif_lower = effectif_str.lower()
+
+    for libelles, effectif in TRANCHES_EFFECTIF:
+        if any(libelle in effectif_lower for libelle in libelles):
+            return effectif
+
+    # Tenter d'extraire un nombre
+    match = _NOMBRE_RE.search(effectif_lower)
+    if match:
+        return int(match.group())
+
+    return 0
 
 
 class PappersAPIError(Exception):
@@ -17,6 +67,10 @@ class PappersAPIError(Exception):
     pass
 
 
+# Statuts HTTP transitoires : la requête est rejouée avant de lever PappersAPIError
+RETRIABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
 class PappersClient:
     """
     Client pour interagir avec l'API Pappers
@@ -30,13 +84,24 @@ class PappersClient:
 
     BASE_URL = "https://api.pappers.fr/v2"
 
-    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+        cache_dir: str = "data",
+        cache_ttl_days: int = 30000,
+        max_workers: int = 8
+    ):
         """
         Initialise le client Pappers
 
         Args:
             api_key: Clé API Pappers (ou via env var PAPPERS_API_KEY)
             use_cache: Activer le cache SQLite (défaut: True, fortement recommandé pour économiser les crédits)
+            cache_dir: Répertoire du cache SQLite
+            cache_ttl_days: Durée de validité du cache en jours
+            max_workers: Nombre de requêtes API simultanées (get_entreprises_batch),
+                qui dimensionne aussi le pool de connexions
         """
         self.api_key = api_key or os.getenv('PAPPERS_API_KEY')
 
@@ -51,13 +116,41 @@ class PappersClient:
             'User-Agent': 'ExplorationApp/1.0'
         })
 
-        # Rate limiting
+        # Pool de connexions keep-alive (dimensionné pour les appels concurrents)
+        # et retries transparents sur les erreurs de connexion ; les statuts
+        # 429/5xx sont rejoués par _get_with_retry (rate limit + Retry-After)
+        self.max_workers = max_workers
+        adapter = HTTPAdapter(
+            pool_maxsize=max_workers,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                allowed_methods=['GET'],
+                # Aucun retry sur statut HTTP côté urllib3 (sinon Retry-After
+                # relance la requête hors rate limiting) : tout passe par _get_with_retry
+                status_forcelist=(),
+                respect_retry_after_header=False
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # Rate limiting (partagé entre threads)
         self.last_request_time = 0
         self.min_request_interval = 0.2  # 5 req/sec max
+        self._rate_limit_lock = threading.Lock()
+
+        # Retries applicatifs sur 429/5xx (backoff exponentiel avec jitter)
+        self.max_retries = 4
+        self.retry_backoff = 0.3
+        self.retry_backoff_max = 10.0
 
         # Cache SQLite pour économiser les crédits API
         self.use_cache = use_cache
-        self.cache = PappersCache() if use_cache else None
+        self.cache = PappersCache(cache_dir, cache_ttl_days) if use_cache else None
+
+        # Entreprises déjà récupérées pendant la vie du client : évite de relire
+        # et redécoder le cache SQLite (get_finances, get_dirigeants, scans répétés)
+        self._entreprises: Dict[str, Dict] = {}
 
         if self.use_cache:
             stats = self.cache.get_stats()
@@ -65,12 +158,61 @@ class PappersClient:
         else:
             logger.info("PappersClient initialized WITHOUT cache (not recommended)")
 
+    def close(self):
+        """Ferme la session HTTP et libère le pool de connexions"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _wait_for_rate_limit(self):
-        """Attend pour respecter le rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        """Attend pour respecter le rate limiting (même avec des appels concurrents)"""
+        with self._rate_limit_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                time.sleep(self.min_request_interval - elapsed)
+            self.last_request_time = time.time()
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Délai avant de rejouer une requête
+
+        Respecte l'en-tête Retry-After s'il est présent, sinon backoff
+        exponentiel avec jitter (évite que les threads repartent ensemble).
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), self.retry_backoff_max)
+            except ValueError:
+                pass  # Format date HTTP : on retombe sur le backoff
+
+        delay = min(self.retry_backoff * (2 ** attempt), self.retry_backoff_max)
+        return delay + random.uniform(0, self.retry_backoff)
+
+    def _get_with_retry(self, endpoint: str, url: str, params: Dict[str, Any]) -> requests.Response:
+        """
+        Effectue le GET en rejouant les réponses transitoires (429/5xx)
+
+        Chaque tentative repasse par le rate limiting. La dernière réponse est
+        renvoyée telle quelle, qu'elle soit en succès ou en erreur.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_rate_limit()
+            response = self.session.get(url, params=params, timeout=30)
+
+            if response.status_code not in RETRIABLE_STATUS or attempt == self.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            logger.warning(
+                f"Pappers HTTP {response.status_code} on {endpoint}, "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+            )
+            time.sleep(delay)
 
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict:
         """
@@ -84,21 +226,20 @@ class PappersClient:
             Réponse JSON
 
         Raises:
-            PappersAPIError: En cas d'erreur API
+            PappersAPIError: En cas d'erreur API non transitoire, ou si les
+                retries sur 429/5xx sont épuisés
         """
-        self._wait_for_rate_limit()
-
         # Ajoute la clé API
         params['api_token'] = self.api_key
 
         url = f"{self.BASE_URL}/{endpoint}"
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._get_with_retry(endpoint, url, params)
 
             # Parse le JSON (même en cas d'erreur HTTP)
             try:
-                data = response.json()
+                data = parse_json_response(response)
             except:
                 data = {}
 
@@ -167,45 +308,7 @@ class PappersClient:
         if not effectif_str or effectif_str == '0 salarié':
             return 0
 
-        effectif_lower = str(effectif_str).lower()
-
-        # Mapping des tranches d'effectif
-        if 'entre 1 et 2' in effectif_lower or '1 ou 2' in effectif_lower:
-            return 2
-        elif 'entre 3 et 5' in effectif_lower or '3 à 5' in effectif_lower:
-            return 4
-        elif 'entre 6 et 9' in effectif_lower or '6 à 9' in effectif_lower:
-            return 8
-        elif 'entre 10 et 19' in effectif_lower or '10 à 19' in effectif_lower:
-            return 15
-        elif 'entre 20 et 49' in effectif_lower or '20 à 49' in effectif_lower:
-            return 35
-        elif 'entre 50 et 99' in effectif_lower or '50 à 99' in effectif_lower:
-            return 75
-        elif 'entre 100 et 199' in effectif_lower or '100 à 199' in effectif_lower:
-            return 150
-        elif 'entre 200 et 249' in effectif_lower or '200 à 249' in effectif_lower:
-            return 225
-        elif 'entre 250 et 499' in effectif_lower or '250 à 499' in effectif_lower:
-            return 375
-        elif 'entre 500 et 999' in effectif_lower or '500 à 999' in effectif_lower:
-            return 750
-        elif 'au moins 1 salarié' in effectif_lower or 'au moins 1' in effectif_lower:
-            return 1
-        elif '2000' in effectif_lower or 'plus de' in effectif_lower:
-            return 2000  # Grande entreprise
-
-        # Tenter d'extraire un nombre
-        try:
-            # Chercher des nombres dans la chaîne
-            import re
-            numbers = re.findall(r'\d+', effectif_lower)
-            if numbers:
-                return int(numbers[0])
-        except:
-            pass
-
-        return 0
+        return _parse_tranche_effectif(str(effectif_str))
 
     def get_entreprise(self, siren: str) -> Dict:
         """
@@ -222,6 +325,9 @@ class PappersClient:
         if not siren.isdigit() or len(siren) != 9:
             raise ValueError(f"SIREN invalide: {siren} (doit être 9 chiffres)")
 
+        if siren in self._entreprises:
+            return self._entreprises[siren]
+
         # Vérifier le cache d'abord
         if self.use_cache:
             cached_data = self.cache.get_entreprise(siren)
@@ -230,6 +336,7 @@ class PappersClient:
                 # Normaliser l'effectif en nombre
                 if 'effectif' in cached_data:
                     cached_data['effectif'] = self._parse_effectif(cached_data['effectif'])
+                self._entreprises[siren] = cached_data
                 return cached_data
 
         # Si pas en cache, faire la requête API
@@ -253,8 +360,67 @@ class PappersClient:
         if 'effectif' in data:
             data['effectif'] = self._parse_effectif(data['effectif'])
 
+        self._entreprises[siren] = data
+
         return data
 
+    def get_entreprises_batch(
+        self,
+        siren_list: List[str],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Récupère les informations de plusieurs entreprises
+
+        Pappers n'a pas d'endpoint multi-SIREN : les entreprises en cache sont
+        lues en une requête SQLite, les autres sont demandées à l'API en parallèle.
+
+        Args:
+            siren_list: Liste de numéros SIREN
+            max_workers: Nombre de requêtes API simultanées (défaut: celui du
+                client ; au-delà, le pool de connexions ne garde pas tout en keep-alive)
+
+        Returns:
+            Dict {siren: données}, dans l'ordre de siren_list (les SIREN en
+            erreur sont journalisés et omis)
+        """
+        sirens = list(dict.fromkeys(siren.replace(' ', '') for siren in siren_list))
+
+        results = {siren: self._entreprises[siren] for siren in sirens if siren in self._entreprises}
+
+        if self.use_cache:
+            missing = [siren for siren in sirens if siren not in results]
+            cached = self.cache.get_entreprises(missing)
+
+            for siren, data in cached.items():
+                # Normaliser l'effectif en nombre
+                if 'effectif' in data:
+                    data['effectif'] = self._parse_effectif(data['effectif'])
+                self._entreprises[siren] = data
+                results[siren] = data
+
+            if cached:
+                logger.info(f"💾 Cache HIT for {len(cached)} SIREN (économie de {len(cached)} crédits API)")
+
+        missing = [siren for siren in sirens if siren not in results]
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                futures = [
+                    (siren, executor.submit(self.get_entreprise, siren))
+                    for siren in missing
+                ]
+
+                for siren, future in futures:
+                    try:
+                        results[siren] = future.result()
+                    except PappersAPIError as e:
+                        logger.error(f"API error for SIREN {siren}: {e}")
+                    except Exception as e:
+                        logger.error(f"Error fetching SIREN {siren}: {e}")
+
+        return {siren: results[siren] for siren in sirens if siren in results}
+
     def get_finances(self, siren: str) -> List[Dict]:
         """
         Récupère uniquement les données financières d'une entreprise
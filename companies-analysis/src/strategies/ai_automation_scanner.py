@@ -12,6 +12,7 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from datetime import datetime
 from typing import List, Dict, Optional
 from loguru import logger
 
@@ -272,7 +273,6 @@ class AIAutomationScanner(ScannerBase):
         # 6. Âge de l'entreprise
         date_creation = data.get('date_creation_entreprise', '')
         if date_creation:
-            from datetime import datetime
             try:
                 creation = datetime.strptime(date_creation, '%Y-%m-%d')
                 age_days = (datetime.now() - creation).days
@@ -3,12 +3,14 @@ Analyseur d'entreprises via API Pappers
 Détecte des insights intéressants sur les entreprises françaises
 """
 
+import heapq
+from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from loguru import logger
 
 from src.core.scanner_base import ScannerBase
 from src.core.opportunity import Opportunity, OpportunityType
-from src.data.pappers_client import PappersClient, PappersAPIError
+from src.data.pappers_client import PappersClient
 
 
 class CompanyAnalyzer(ScannerBase):
@@ -22,6 +24,9 @@ class CompanyAnalyzer(ScannerBase):
     - Entreprises potentiellement intéressantes
     """
 
+    # Nom constant, lu à chaque Opportunity créée
+    _name = "CompanyAnalyzer"
+
     def __init__(self, config: dict = None):
         """
         Initialise l'analyseur
@@ -32,13 +37,21 @@ class CompanyAnalyzer(ScannerBase):
         - min_ca: CA minimum pour considérer l'entreprise
         - min_growth_rate: Taux de croissance minimum (%)
         - min_margin: Marge minimum (%)
+        - cache_dir: Répertoire du cache Pappers (défaut: data)
+        - cache_ttl_days: Durée de validité du cache Pappers en jours
+        - max_workers: Nombre de requêtes Pappers simultanées (défaut: 8)
         """
         super().__init__(config)
 
         # Initialise le client Pappers
         api_key = self.config.get('pappers_api_key')
         try:
-            self.pappers = PappersClient(api_key=api_key)
+            self.pappers = PappersClient(
+                api_key=api_key,
+                cache_dir=self.config.get('cache_dir', 'data'),
+                cache_ttl_days=self.config.get('cache_ttl_days', 30000),
+                max_workers=self.config.get('max_workers', 8)
+            )
         except ValueError as e:
             logger.error(f"Failed to initialize Pappers client: {e}")
             raise
@@ -49,7 +62,7 @@ class CompanyAnalyzer(ScannerBase):
         self.min_margin = self.config.get('min_margin', 10)  # 10%
 
     def get_name(self) -> str:
-        return "CompanyAnalyzer"
+        return self._name
 
     def scan(self) -> List[Opportunity]:
         """
@@ -68,12 +81,13 @@ class CompanyAnalyzer(ScannerBase):
 
         logger.info(f"Analyzing {len(siren_list)} companies")
 
-        for siren in siren_list:
+        # Récupère toutes les entreprises d'un coup (cache groupé + API en parallèle)
+        data_by_siren = self.pappers.get_entreprises_batch(siren_list)
+
+        for siren, data in data_by_siren.items():
             try:
-                company_opps = self._analyze_company(siren)
+                company_opps = self._analyze_from_data(siren, data)
                 opportunities.extend(company_opps)
-            except PappersAPIError as e:
-                logger.error(f"API error for SIREN {siren}: {e}")
             except Exception as e:
                 logger.error(f"Error analyzing SIREN {siren}: {e}")
 
@@ -89,11 +103,24 @@ class CompanyAnalyzer(ScannerBase):
         Returns:
             Liste d'opportunités pour cette entreprise
         """
-        opportunities = []
-
         # Récupère les données complètes
         data = self.pappers.get_entreprise(siren)
 
+        return self._analyze_from_data(siren, data)
+
+    def _analyze_from_data(self, siren: str, data: Dict[str, Any]) -> List[Opportunity]:
+        """
+        Détecte les insights à partir des données Pappers déjà récupérées
+
+        Args:
+            siren: Numéro SIREN
+            data: Données complètes de l'entreprise (get_entreprise)
+
+        Returns:
+            Liste d'opportunités pour cette entreprise
+        """
+        opportunities = []
+
         denomination = data.get('nom_entreprise', 'Entreprise inconnue')
         logger.info(f"Analyzing: {denomination} ({siren})")
 
@@ -127,34 +154,36 @@ class CompanyAnalyzer(ScannerBase):
         """
         opportunities = []
 
-        # Trie par année décroissante
-        finances = sorted(
-            finances,
-            key=lambda x: x.get('date_cloture_exercice', ''),
-            reverse=True
-        )
-
         # Compare les 2 derniers exercices
         if len(finances) < 2:
             return opportunities
 
-        dernier = finances[0]
-        precedent = finances[1]
+        # Seuls les 2 exercices les plus récents servent : pas besoin de tout trier
+        dernier, precedent = heapq.nlargest(
+            2,
+            finances,
+            key=lambda x: x.get('date_cloture_exercice') or ''
+        )
 
         ca_dernier = dernier.get('chiffre_affaires')
-        ca_precedent = precedent.get('chiffre_affaires')
-        resultat_dernier = dernier.get('resultat')
 
-        # Vérifie les données
-        if None in [ca_dernier, ca_precedent, resultat_dernier]:
+        # Filtre CA minimum en premier : la plupart des entreprises s'arrêtent là
+        if ca_dernier is None:
             logger.debug(f"Missing financial data for {siren}")
             return opportunities
 
-        # Filtre CA minimum
         if ca_dernier < self.min_ca:
             logger.debug(f"CA too low for {siren}: {ca_dernier}")
             return opportunities
 
+        ca_precedent = precedent.get('chiffre_affaires')
+        resultat_dernier = dernier.get('resultat')
+
+        # Vérifie les données
+        if ca_precedent is None or resultat_dernier is None:
+            logger.debug(f"Missing financial data for {siren}")
+            return opportunities
+
         # 1. Détecte la croissance
         if ca_precedent > 0:
             growth_rate = ((ca_dernier - ca_precedent) / ca_precedent) * 100
@@ -165,7 +194,7 @@ class CompanyAnalyzer(ScannerBase):
                 opportunities.append(Opportunity(
                     opportunity_type=OpportunityType.FINANCIAL_GROWTH,
                     symbol=siren,
-                    strategy=self.get_name(),
+                    strategy=self._name,
                     profit_potential=growth_rate,
                     confidence=confidence,
                     data={
@@ -191,7 +220,7 @@ class CompanyAnalyzer(ScannerBase):
                 opportunities.append(Opportunity(
                     opportunity_type=OpportunityType.HIGH_MARGIN,
                     symbol=siren,
-                    strategy=self.get_name(),
+                    strategy=self._name,
                     profit_potential=marge,
                     confidence=confidence,
                     data={
@@ -225,8 +254,6 @@ class CompanyAnalyzer(ScannerBase):
         opportunities = []
 
         # Cherche les dirigeants récents (moins de 6 mois)
-        from datetime import datetime, timedelta
-
         recent_threshold = datetime.now() - timedelta(days=180)
 
         for dirigeant in dirigeants:
@@ -237,10 +264,13 @@ class CompanyAnalyzer(ScannerBase):
 
             try:
                 # Parse la date (format attendu: "YYYY-MM-DD" ou "DD/MM/YYYY")
+                # (parsing manuel bien plus rapide que strptime, mêmes formats acceptés :
+                # pas de fromisoformat, qui accepterait heures et fuseaux)
                 if '/' in date_prise_poste:
-                    date_obj = datetime.strptime(date_prise_poste, "%d/%m/%Y")
+                    jour, mois, annee = date_prise_poste.split('/')
                 else:
-                    date_obj = datetime.strptime(date_prise_poste, "%Y-%m-%d")
+                    annee, mois, jour = date_prise_poste.split('-')
+                date_obj = datetime(int(annee), int(mois), int(jour))
 
                 if date_obj >= recent_threshold:
                     qualite = dirigeant.get('qualite', 'Dirigeant')
@@ -250,14 +280,13 @@ class CompanyAnalyzer(ScannerBase):
                     nom_complet = f"{prenom} {nom}".strip()
 
                     # Score de confiance basé sur la qualité
-                    confidence = 70
-                    if 'président' in qualite.lower():
-                        confidence = 85
+                    is_president = 'président' in qualite.lower()
+                    confidence = 85 if is_president else 70
 
                     opportunities.append(Opportunity(
                         opportunity_type=OpportunityType.MANAGEMENT_CHANGE,
                         symbol=siren,
-                        strategy=self.get_name(),
+                        strategy=self._name,
                         profit_potential=0,  # Pas de profit quantifiable
                         confidence=confidence,
                         data={
@@ -272,7 +301,7 @@ class CompanyAnalyzer(ScannerBase):
                         }
                     ))
 
-            except ValueError:
+            except (ValueError, TypeError):
                 logger.debug(f"Invalid date format for {siren}: {date_prise_poste}")
                 continue
 
@@ -290,6 +319,10 @@ class CompanyAnalyzer(ScannerBase):
         """
         return self._analyze_company(siren)
 
+    def close(self):
+        """Libère les connexions HTTP du client Pappers"""
+        self.pappers.close()
+
     def search_and_analyze(
         self,
         query: str,
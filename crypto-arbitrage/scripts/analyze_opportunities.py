@@ -4,15 +4,42 @@ Génère un rapport complet des opportunités d'arbitrage
 """
 
 import sqlite3
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 
 
+def _median_profit(cursor: sqlite3.Cursor, total: int) -> float:
+    """
+    Calcule la médiane du profit côté SQLite (pas de fonction MEDIAN native)
+
+    Args:
+        cursor: Curseur sur la DB
+        total: Nombre total d'opportunités
+
+    Returns:
+        Profit médian en %
+    """
+    # 1 valeur centrale si total impair, moyenne des 2 centrales sinon
+    cursor.execute('''
+        SELECT AVG(profit_potential) FROM (
+            SELECT profit_potential
+            FROM opportunities
+            ORDER BY profit_potential
+            LIMIT ? OFFSET ?
+        )
+    ''', (2 - total % 2, (total - 1) // 2))
+    return cursor.fetchone()[0]
+
+
 def analyze_opportunities(db_path: str = "data/opportunities.db"):
     """
     Analyse les opportunités stockées dans la base de données
 
+    Les agrégations sont calculées par SQLite : seuls des scalaires et de
+    petits résultats (top N, groupes) remontent en Python.
+
     Args:
         db_path: Chemin vers la DB SQLite
     """
@@ -23,11 +50,26 @@ def analyze_opportunities(db_path: str = "data/opportunities.db"):
 
     # Connexion à la DB
     conn = sqlite3.connect(db_path)
-
-    # Charge toutes les opportunités
-    df = pd.read_sql_query("SELECT * FROM opportunities", conn)
-
-    if df.empty:
+    cursor = conn.cursor()
+
+    # Toutes les statistiques scalaires en un seul parcours de la table
+    cursor.execute('''
+        SELECT COUNT(*),
+               AVG(profit_potential),
+               MAX(profit_potential),
+               MIN(profit_potential),
+               AVG(confidence),
+               SUM(confidence > 70),
+               SUM(confidence BETWEEN 50 AND 70),
+               SUM(confidence > 70 AND profit_potential > 0.5)
+        FROM opportunities
+    ''')
+    (
+        total, avg_profit, max_profit, min_profit, avg_confidence,
+        high_confidence, medium_confidence, high_quality_count
+    ) = cursor.fetchone()
+
+    if total == 0:
         print("📊 No opportunities found in database yet.")
         print("\n💡 Tips:")
         print("   - Run a scan with: python main.py --scan")
@@ -39,7 +81,7 @@ def analyze_opportunities(db_path: str = "data/opportunities.db"):
     print("📊 CRYPTO ARBITRAGE OPPORTUNITIES REPORT")
     print("=" * 80)
     print(f"\n📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"📈 Total opportunities found: {len(df)}")
+    print(f"📈 Total opportunities found: {total}")
 
     # Statistiques générales
     print("\n" + "=" * 80)
@@ -47,85 +89,115 @@ def analyze_opportunities(db_path: str = "data/opportunities.db"):
     print("=" * 80)
 
     print(f"\n🔍 Opportunity Types:")
-    if 'opportunity_type' in df.columns:
-        type_counts = df['opportunity_type'].value_counts()
-        for opp_type, count in type_counts.items():
-            print(f"   - {opp_type}: {count}")
+    cursor.execute('''
+        SELECT opportunity_type, COUNT(*) as count
+        FROM opportunities
+        GROUP BY opportunity_type
+        ORDER BY count DESC
+    ''')
+    sys.stdout.write("".join(
+        f"   - {opp_type}: {count}\n"
+        for opp_type, count in cursor.fetchall()
+    ))
 
     print(f"\n💰 Profit Statistics:")
-    if 'profit_potential' in df.columns:
-        print(f"   - Average profit: {df['profit_potential'].mean():.2f}%")
-        print(f"   - Median profit: {df['profit_potential'].median():.2f}%")
-        print(f"   - Max profit: {df['profit_potential'].max():.2f}%")
-        print(f"   - Min profit: {df['profit_potential'].min():.2f}%")
+    print(f"   - Average profit: {avg_profit:.2f}%")
+    print(f"   - Median profit: {_median_profit(cursor, total):.2f}%")
+    print(f"   - Max profit: {max_profit:.2f}%")
+    print(f"   - Min profit: {min_profit:.2f}%")
 
     print(f"\n📊 Confidence Statistics:")
-    if 'confidence' in df.columns:
-        print(f"   - Average confidence: {df['confidence'].mean():.1f}/100")
-        print(f"   - High confidence (>70): {len(df[df['confidence'] > 70])} opportunities")
-        print(f"   - Medium confidence (50-70): {len(df[(df['confidence'] >= 50) & (df['confidence'] <= 70)])} opportunities")
+    print(f"   - Average confidence: {avg_confidence:.1f}/100")
+    print(f"   - High confidence (>70): {high_confidence} opportunities")
+    print(f"   - Medium confidence (50-70): {medium_confidence} opportunities")
 
     # Top opportunités
     print("\n" + "=" * 80)
     print("🏆 TOP 10 OPPORTUNITIES (by profit)")
     print("=" * 80)
 
-    top_10 = df.nlargest(10, 'profit_potential')
-    for i, row in top_10.iterrows():
-        print(f"\n{row.name + 1}. {row['symbol']}")
-        print(f"   💰 Profit: {row['profit_potential']:.2f}%")
-        print(f"   📊 Confidence: {row['confidence']:.0f}/100")
-        print(f"   🏷️  Strategy: {row['strategy']}")
-        if 'created_at' in row:
-            print(f"   ⏰ Found at: {row['created_at']}")
+    cursor.execute('''
+        SELECT symbol, profit_potential, confidence, strategy, timestamp
+        FROM opportunities
+        ORDER BY profit_potential DESC
+        LIMIT 10
+    ''')
+    # Une seule écriture par section plutôt qu'un print par ligne
+    sys.stdout.write("".join(
+        f"\n{rank}. {symbol}\n"
+        f"   💰 Profit: {profit:.2f}%\n"
+        f"   📊 Confidence: {confidence:.0f}/100\n"
+        f"   🏷️  Strategy: {strategy}\n"
+        f"   ⏰ Found at: {found_at}\n"
+        for rank, (symbol, profit, confidence, strategy, found_at) in enumerate(cursor.fetchall(), 1)
+    ))
 
     # Opportunités par symbole
     print("\n" + "=" * 80)
     print("💎 MOST PROFITABLE SYMBOLS")
     print("=" * 80)
 
-    if 'symbol' in df.columns:
-        symbol_stats = df.groupby('symbol').agg({
-            'profit_potential': ['count', 'mean', 'max'],
-            'confidence': 'mean'
-        }).round(2)
+    symbol_stats = pd.read_sql_query('''
+        SELECT symbol,
+               COUNT(*) AS "Count",
+               ROUND(AVG(profit_potential), 2) AS "Avg Profit %",
+               ROUND(MAX(profit_potential), 2) AS "Max Profit %",
+               ROUND(AVG(confidence), 2) AS "Avg Confidence"
+        FROM opportunities
+        GROUP BY symbol
+        ORDER BY MAX(profit_potential) DESC
+        LIMIT 10
+    ''', conn, index_col='symbol')
 
-        symbol_stats.columns = ['Count', 'Avg Profit %', 'Max Profit %', 'Avg Confidence']
-        symbol_stats = symbol_stats.sort_values('Max Profit %', ascending=False).head(10)
-
-        print("\n", symbol_stats.to_string())
+    print("\n", symbol_stats.to_string())
 
     # Opportunités récentes (dernières 24h)
     print("\n" + "=" * 80)
     print("⏰ RECENT OPPORTUNITIES (Last 24h)")
     print("=" * 80)
 
-    if 'created_at' in df.columns:
-        df['created_at'] = pd.to_datetime(df['created_at'])
-        recent = df[df['created_at'] > datetime.now() - timedelta(hours=24)]
-        print(f"\n📊 {len(recent)} opportunities found in the last 24 hours")
-
-        if not recent.empty:
-            print(f"\n   Best recent opportunity:")
-            best_recent = recent.nlargest(1, 'profit_potential').iloc[0]
-            print(f"   • {best_recent['symbol']}")
-            print(f"   • Profit: {best_recent['profit_potential']:.2f}%")
-            print(f"   • Confidence: {best_recent['confidence']:.0f}/100")
+    # timestamp est stocké en ISO 8601 : la comparaison de chaînes suffit
+    since = (datetime.now() - timedelta(hours=24)).isoformat()
+
+    cursor.execute('SELECT COUNT(*) FROM opportunities WHERE timestamp > ?', (since,))
+    recent_count = cursor.fetchone()[0]
+    print(f"\n📊 {recent_count} opportunities found in the last 24 hours")
+
+    if recent_count:
+        cursor.execute('''
+            SELECT symbol, profit_potential, confidence
+            FROM opportunities
+            WHERE timestamp > ?
+            ORDER BY profit_potential DESC
+            LIMIT 1
+        ''', (since,))
+        symbol, profit, confidence = cursor.fetchone()
+        print(f"\n   Best recent opportunity:")
+        print(f"   • {symbol}")
+        print(f"   • Profit: {profit:.2f}%")
+        print(f"   • Confidence: {confidence:.0f}/100")
 
     # Recommandations
     print("\n" + "=" * 80)
     print("💡 RECOMMENDATIONS")
     print("=" * 80)
 
-    high_confidence_profitable = df[(df['confidence'] > 70) & (df['profit_potential'] > 0.5)]
-
-    if len(high_confidence_profitable) > 0:
-        print(f"\n✅ {len(high_confidence_profitable)} HIGH-QUALITY opportunities found!")
+    if high_quality_count > 0:
+        print(f"\n✅ {high_quality_count} HIGH-QUALITY opportunities found!")
         print("\n   Top 3 to explore:")
-        for i, row in high_confidence_profitable.nlargest(3, 'profit_potential').iterrows():
-            print(f"\n   {i+1}. {row['symbol']}")
-            print(f"      💰 {row['profit_potential']:.2f}% profit")
-            print(f"      📊 {row['confidence']:.0f}/100 confidence")
+        cursor.execute('''
+            SELECT symbol, profit_potential, confidence
+            FROM opportunities
+            WHERE confidence > 70 AND profit_potential > 0.5
+            ORDER BY profit_potential DESC
+            LIMIT 3
+        ''')
+        sys.stdout.write("".join(
+            f"\n   {rank}. {symbol}\n"
+            f"      💰 {profit:.2f}% profit\n"
+            f"      📊 {confidence:.0f}/100 confidence\n"
+            for rank, (symbol, profit, confidence) in enumerate(cursor.fetchall(), 1)
+        ))
     else:
         print("\n⚠️  No high-confidence opportunities found yet.")
         print("\n   Suggestions:")
@@ -138,11 +210,16 @@ def analyze_opportunities(db_path: str = "data/opportunities.db"):
     print("📊 TEMPORAL ANALYSIS")
     print("=" * 80)
 
-    if 'created_at' in df.columns:
-        df['hour'] = df['created_at'].dt.hour
-        hourly = df.groupby('hour')['profit_potential'].agg(['count', 'mean'])
-        print("\n   Opportunities by hour of day:")
-        print("\n", hourly.to_string())
+    hourly = pd.read_sql_query('''
+        SELECT CAST(strftime('%H', timestamp) AS INTEGER) AS hour,
+               COUNT(*) AS count,
+               AVG(profit_potential) AS mean
+        FROM opportunities
+        GROUP BY hour
+        ORDER BY hour
+    ''', conn, index_col='hour')
+    print("\n   Opportunities by hour of day:")
+    print("\n", hourly.to_string())
 
     conn.close()
 
@@ -3,9 +3,11 @@ Gestionnaire d'exchanges pour récupérer les prix et données
 """
 
 import ccxt
-from typing import Dict, List, Optional
+import ccxt.async_support as ccxt_async
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import asyncio
+import time
 
 
 class ExchangeManager:
@@ -15,17 +17,24 @@ class ExchangeManager:
     Supporte tous les exchanges via CCXT
     """
 
-    def __init__(self, exchange_ids: List[str] = None):
+    def __init__(self, exchange_ids: List[str] = None, ticker_cache_ttl: float = 2.0):
         """
         Initialise les connexions aux exchanges
 
         Args:
             exchange_ids: Liste des IDs d'exchanges (ex: ['binance', 'kraken'])
+            ticker_cache_ttl: Durée de validité des tickers en cache, en secondes
+                (0 pour désactiver). Garder court : l'arbitrage est sensible aux prix périmés
         """
         self.exchange_ids = exchange_ids or ['binance', 'kraken', 'coinbase']
         self.exchanges: Dict[str, ccxt.Exchange] = {}
         self._initialize_exchanges()
 
+        # Tickers récents {symbol: (timestamp monotonic, {exchange_id: ticker})}
+        # pour les scans rapprochés (dashboard live)
+        self.ticker_cache_ttl = ticker_cache_ttl
+        self._ticker_cache: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+
     def _initialize_exchanges(self):
         """Initialise les connexions aux exchanges"""
         for exchange_id in self.exchange_ids:
@@ -62,22 +71,50 @@ class ExchangeManager:
             logger.debug(f"Error fetching ticker {symbol} from {exchange_id}: {e}")
             return None
 
-    def get_tickers_all_exchanges(self, symbol: str) -> Dict[str, dict]:
+    def _get_cached_tickers(self, symbol: str) -> Optional[Dict[str, dict]]:
+        """Retourne les tickers en cache pour un symbole s'ils sont encore valides"""
+        cached = self._ticker_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.ticker_cache_ttl:
+            return cached[1]
+        return None
+
+    def _cache_tickers(self, symbol: str, tickers: Dict[str, dict]):
+        """Met en cache les tickers d'un symbole"""
+        if self.ticker_cache_ttl > 0:
+            self._ticker_cache[symbol] = (time.monotonic(), tickers)
+
+    def get_tickers_all_exchanges(
+        self,
+        symbol: str,
+        force_refresh: bool = False,
+        exchange_ids: Optional[List[str]] = None
+    ) -> Dict[str, dict]:
         """
         Récupère le ticker pour un symbole sur tous les exchanges
 
         Args:
             symbol: Symbole (ex: 'BTC/USDT')
+            force_refresh: Ignorer le cache de tickers
+            exchange_ids: Exchanges à interroger, déjà connus pour lister le
+                symbole (voir get_symbol_plan). Par défaut : tous ceux qui le listent
 
         Returns:
             Dict {exchange_id: ticker_data}
         """
+        if not force_refresh:
+            cached = self._get_cached_tickers(symbol)
+            if cached is not None:
+                return cached
+
         tickers = {}
 
         for exchange_id, exchange in self.exchanges.items():
             try:
                 # Vérifie si le symbole existe sur cet exchange
-                if not self._symbol_exists(exchange, symbol):
+                if exchange_ids is not None:
+                    if exchange_id not in exchange_ids:
+                        continue
+                elif not self._symbol_exists(exchange, symbol):
                     continue
 
                 ticker = exchange.fetch_ticker(symbol)
@@ -87,8 +124,168 @@ class ExchangeManager:
                 logger.debug(f"Error fetching {symbol} from {exchange_id}: {e}")
                 continue
 
+        self._cache_tickers(symbol, tickers)
+        return tickers
+
+    async def get_tickers_all_exchanges_async(
+        self,
+        symbol: str,
+        async_exchanges: Dict[str, ccxt_async.Exchange],
+        exchange_ids: Optional[List[str]] = None
+    ) -> Dict[str, dict]:
+        """
+        Version async de get_tickers_all_exchanges : interroge les exchanges en parallèle
+
+        Args:
+            symbol: Symbole (ex: 'BTC/USDT')
+            async_exchanges: Instances async créées par _create_async_exchanges
+            exchange_ids: Exchanges à interroger (voir get_symbol_plan).
+                Par défaut : tous ceux qui listent le symbole
+
+        Returns:
+            Dict {exchange_id: ticker_data}
+        """
+        if exchange_ids is None:
+            exchange_ids = [
+                exchange_id for exchange_id in async_exchanges
+                if self._symbol_exists(self.exchanges[exchange_id], symbol)
+            ]
+        else:
+            exchange_ids = [
+                exchange_id for exchange_id in exchange_ids
+                if exchange_id in async_exchanges
+            ]
+
+        results = await asyncio.gather(
+            *[async_exchanges[exchange_id].fetch_ticker(symbol) for exchange_id in exchange_ids],
+            return_exceptions=True
+        )
+
+        tickers = {}
+        for exchange_id, result in zip(exchange_ids, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Error fetching {symbol} from {exchange_id}: {result}")
+                continue
+            tickers[exchange_id] = result
+
         return tickers
 
+    async def get_tickers_many_async(
+        self,
+        symbols: List[str],
+        force_refresh: bool = False,
+        symbol_plan: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Dict[str, dict]]:
+        """
+        Récupère les tickers de plusieurs symboles sur tous les exchanges en parallèle
+
+        Toutes les requêtes (symbole x exchange) partent en même temps : la durée
+        totale est celle de la plus lente, pas leur somme. Les symboles dont les
+        tickers sont encore en cache ne sont pas redemandés.
+
+        Args:
+            symbols: Liste de symboles
+            force_refresh: Ignorer le cache de tickers
+            symbol_plan: Exchanges à interroger par symbole (voir get_symbol_plan)
+
+        Returns:
+            Dict {symbol: {exchange_id: ticker_data}}
+        """
+        symbol_plan = symbol_plan or {}
+        tickers_by_symbol = {}
+        if not force_refresh:
+            for symbol in symbols:
+                cached = self._get_cached_tickers(symbol)
+                if cached is not None:
+                    tickers_by_symbol[symbol] = cached
+
+        to_fetch = [symbol for symbol in symbols if symbol not in tickers_by_symbol]
+
+        if to_fetch:
+            self.load_markets_all()
+
+            async_exchanges = self._create_async_exchanges()
+            try:
+                results = await asyncio.gather(*[
+                    self.get_tickers_all_exchanges_async(
+                        symbol, async_exchanges, symbol_plan.get(symbol)
+                    )
+                    for symbol in to_fetch
+                ])
+            finally:
+                # Ferme les sessions HTTP async (une par exchange et par scan)
+                await asyncio.gather(
+                    *[exchange.close() for exchange in async_exchanges.values()],
+                    return_exceptions=True
+                )
+
+            for symbol, tickers in zip(to_fetch, results):
+                self._cache_tickers(symbol, tickers)
+                tickers_by_symbol[symbol] = tickers
+
+        return {symbol: tickers_by_symbol[symbol] for symbol in symbols}
+
+    def _create_async_exchanges(self) -> Dict[str, ccxt_async.Exchange]:
+        """
+        Crée les instances ccxt.async_support des exchanges initialisés
+
+        Les marchés déjà chargés par les instances sync sont réutilisés pour
+        éviter un second load_markets par exchange.
+        """
+        async_exchanges = {}
+
+        for exchange_id, exchange in self.exchanges.items():
+            try:
+                async_exchange = getattr(ccxt_async, exchange_id)({
+                    'enableRateLimit': True,
+                    'timeout': 30000,
+                })
+                if exchange.markets:
+                    async_exchange.set_markets(exchange.markets, exchange.currencies)
+                async_exchanges[exchange_id] = async_exchange
+            except Exception as e:
+                logger.warning(f"Failed to initialize async {exchange_id}: {e}")
+
+        return async_exchanges
+
+    def load_markets_all(self, reload: bool = False):
+        """
+        Charge les marchés de tous les exchanges (une seule fois par exchange)
+
+        Args:
+            reload: Recharger même les marchés déjà chargés (nouveaux listings)
+        """
+        for exchange_id, exchange in self.exchanges.items():
+            try:
+                if reload or not exchange.markets:
+                    exchange.load_markets(reload=reload)
+            except Exception as e:
+                logger.warning(f"Error loading markets for {exchange_id}: {e}")
+
+    def get_symbol_plan(self, symbols: List[str], reload: bool = False) -> Dict[str, List[str]]:
+        """
+        Associe chaque symbole aux exchanges qui le listent
+
+        Permet de ne pas interroger d'exchange pour un symbole qu'il ne liste
+        pas, et d'écarter d'emblée les symboles sans arbitrage possible.
+
+        Args:
+            symbols: Liste de symboles
+            reload: Recharger les marchés avant de construire le plan
+
+        Returns:
+            Dict {symbol: [exchange_id, ...]}
+        """
+        self.load_markets_all(reload=reload)
+
+        return {
+            symbol: [
+                exchange_id for exchange_id, exchange in self.exchanges.items()
+                if exchange.markets and symbol in exchange.markets
+            ]
+            for symbol in symbols
+        }
+
     def _symbol_exists(self, exchange: ccxt.Exchange, symbol: str) -> bool:
         """Vérifie si un symbole existe sur un exchange"""
         try:
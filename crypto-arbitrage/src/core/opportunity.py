@@ -2,6 +2,7 @@
 Modèle de données pour représenter une opportunité de trading
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -26,7 +27,12 @@ class OpportunityType(Enum):
     OTHER = "other"
 
 
-@dataclass
+# Slots (Python 3.10+) : pas de __dict__ par instance, construction et accès
+# aux attributs plus rapides pour les nombreuses opportunités créées par scan
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Opportunity:
     """
     Représente une opportunité de trading détectée
@@ -69,9 +69,12 @@ class OpportunityStorage:
             ON opportunities(symbol)
         ''')
 
+        # Couvre le tri par profit et le filtre sur la confiance
+        # (top N, meilleures opportunités, recommandations)
+        cursor.execute('DROP INDEX IF EXISTS idx_profit')
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_profit
-            ON opportunities(profit_potential DESC)
+            CREATE INDEX IF NOT EXISTS idx_profit_confidence
+            ON opportunities(profit_potential DESC, confidence)
         ''')
 
         conn.commit()
@@ -3,9 +3,12 @@ Scanner d'arbitrage crypto entre exchanges
 Détecte les différences de prix exploitables
 """
 
-from typing import List, Dict, Tuple
+import asyncio
+import time
+from bisect import bisect_left
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
-from itertools import combinations
 
 from src.core.scanner_base import ScannerBase
 from src.core.opportunity import Opportunity, OpportunityType
@@ -22,6 +25,15 @@ class CryptoArbitrageScanner(ScannerBase):
     - Vérifie liquidité minimale
     """
 
+    # Nom constant, lu à chaque Opportunity créée
+    _name = "Crypto Arbitrage Scanner"
+
+    # Paliers de confiance : bonus[i] s'applique au-delà (strictement) de thresholds[i-1]
+    _PROFIT_THRESHOLDS = (0.5, 1, 2)  # %
+    _PROFIT_BONUS = (0, 5, 10, 20)
+    _VOL_THRESHOLDS = (1_000_000, 5_000_000, 10_000_000)  # USD
+    _VOL_BONUS = (0, 5, 10, 15)
+
     def __init__(self, config: dict = None):
         """
         Initialise le scanner d'arbitrage
@@ -30,8 +42,11 @@ class CryptoArbitrageScanner(ScannerBase):
             - exchanges: Liste d'exchanges à scanner (default: binance, kraken, coinbase)
             - symbols: Liste de symboles à scanner (default: majors)
             - min_profit: Profit minimum en % (default: 0.5%)
-            - min_volume_24h: Volume minimum 24h en USD (default: 1M)
+            - min_volume_24h: Volume minimum 24h en USD, sur au moins un exchange de chaque paire (default: 1M)
             - include_withdrawal_fee: Inclure frais de retrait (default: True)
+            - ticker_cache_ttl: Durée de cache des tickers en secondes (default: 2, 0 pour désactiver)
+            - symbol_plan_ttl: Durée avant de recharger les marchés et reconstruire
+              le plan symbole -> exchanges, en secondes (default: 86400)
         """
         super().__init__(config)
 
@@ -42,7 +57,18 @@ class CryptoArbitrageScanner(ScannerBase):
         self.include_withdrawal_fee = self.get_config('include_withdrawal_fee', True)
 
         # Initialise le gestionnaire d'exchanges
-        self.exchange_manager = ExchangeManager(exchanges)
+        self.exchange_manager = ExchangeManager(
+            exchanges,
+            ticker_cache_ttl=self.get_config('ticker_cache_ttl', 2.0)
+        )
+
+        # Fees de trading {(exchange_id, symbol): fee %}, recalculés à chaque scan
+        self._fee_cache: Dict[Tuple[str, str], float] = {}
+
+        # Plan {symbol: exchanges qui le listent}, construit au premier scan
+        self.symbol_plan_ttl = self.get_config('symbol_plan_ttl', 86400)
+        self._symbol_plan: Dict[str, List[str]] = {}
+        self._symbol_plan_built_at: Optional[float] = None
 
         logger.info(
             f"CryptoArbitrageScanner initialized: "
@@ -65,57 +91,99 @@ class CryptoArbitrageScanner(ScannerBase):
         ]
 
     def get_name(self) -> str:
-        return "Crypto Arbitrage Scanner"
+        return self._name
 
-    def scan(self) -> List[Opportunity]:
+    def _get_symbol_plan(self) -> Dict[str, List[str]]:
+        """
+        Retourne les symboles scannables et les exchanges à interroger pour chacun
+
+        Les symboles listés sur moins de 2 exchanges sont écartés : inutile de
+        récupérer leurs tickers. Le plan est reconstruit après symbol_plan_ttl.
+
+        Returns:
+            Dict {symbol: [exchange_id, ...]}
+        """
+        now = time.monotonic()
+        built_at = self._symbol_plan_built_at
+
+        if built_at is not None and now - built_at < self.symbol_plan_ttl:
+            return self._symbol_plan
+
+        plan = self.exchange_manager.get_symbol_plan(self.symbols, reload=built_at is not None)
+
+        skipped = [symbol for symbol, exchange_ids in plan.items() if len(exchange_ids) < 2]
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} symbols listed on <2 exchanges: {', '.join(skipped)}")
+
+        self._symbol_plan = {
+            symbol: exchange_ids for symbol, exchange_ids in plan.items()
+            if len(exchange_ids) >= 2
+        }
+
+        # Si un exchange n'a pas pu charger ses marchés, on réessaie au prochain scan
+        if all(exchange.markets for exchange in self.exchange_manager.exchanges.values()):
+            self._symbol_plan_built_at = now
+
+        return self._symbol_plan
+
+    def scan(self, force_refresh: bool = False) -> List[Opportunity]:
         """
         Scanne toutes les paires sur tous les exchanges pour trouver des arbitrages
 
+        Args:
+            force_refresh: Ignorer le cache de tickers (prix garantis frais)
+
+        Returns:
+            Liste d'opportunités d'arbitrage
+        """
+        return asyncio.run(self._scan_async(force_refresh))
+
+    async def _scan_async(self, force_refresh: bool = False) -> List[Opportunity]:
+        """
+        Scan avec récupération concurrente des tickers (tous symboles, tous exchanges)
+
+        Args:
+            force_refresh: Ignorer le cache de tickers
+
         Returns:
             Liste d'opportunités d'arbitrage
         """
         opportunities = []
 
-        for symbol in self.symbols:
-            # Récupère les prix sur tous les exchanges
-            tickers = self.exchange_manager.get_tickers_all_exchanges(symbol)
+        symbol_plan = self._get_symbol_plan()
+
+        # Récupère les prix de tous les symboles sur leurs exchanges en parallèle
+        tickers_by_symbol = await self.exchange_manager.get_tickers_many_async(
+            list(symbol_plan),
+            force_refresh=force_refresh,
+            symbol_plan=symbol_plan
+        )
+
+        # Fees calculés une seule fois par (exchange, symbole) plutôt qu'à chaque paire
+        self._fee_cache = {
+            (exchange_id, symbol): self.exchange_manager.get_trading_fee(exchange_id, symbol)
+            for symbol, exchange_ids in symbol_plan.items()
+            for exchange_id in exchange_ids
+        }
+
+        for symbol in symbol_plan:
+            tickers = tickers_by_symbol[symbol]
 
             if len(tickers) < 2:
                 logger.debug(f"Symbol {symbol} available on <2 exchanges, skipping")
                 continue
 
-            # Vérifie volume minimum
-            if not self._check_volume(tickers):
-                continue
-
             # Trouve les opportunités d'arbitrage pour ce symbole
-            symbol_opportunities = self._find_arbitrage_opportunities(symbol, tickers)
-            opportunities.extend(symbol_opportunities)
+            opportunities.extend(self._find_arbitrage_opportunities(symbol, tickers))
 
         logger.info(f"Found {len(opportunities)} arbitrage opportunities")
         return opportunities
 
-    def _check_volume(self, tickers: Dict[str, dict]) -> bool:
-        """
-        Vérifie que le volume 24h est suffisant
-
-        Args:
-            tickers: Dict des tickers par exchange
-
-        Returns:
-            True si volume OK
-        """
-        for ticker in tickers.values():
-            volume_usd = ticker.get('quoteVolume', 0) or 0
-            if volume_usd >= self.min_volume_24h:
-                return True
-        return False
-
     def _find_arbitrage_opportunities(
         self,
         symbol: str,
         tickers: Dict[str, dict]
-    ) -> List[Opportunity]:
+    ) -> Iterator[Opportunity]:
         """
         Trouve les opportunités d'arbitrage pour un symbole
 
@@ -123,100 +191,111 @@ class CryptoArbitrageScanner(ScannerBase):
             symbol: Symbole à analyser
             tickers: Tickers de tous les exchanges
 
-        Returns:
-            Liste d'opportunités
+        Yields:
+            Opportunités, au fil de leur détection
         """
-        opportunities = []
-
-        # Compare toutes les paires d'exchanges
-        exchange_pairs = list(combinations(tickers.keys(), 2))
+        exchange_ids = list(tickers)
 
-        for exchange_buy, exchange_sell in exchange_pairs:
-            ticker_buy = tickers[exchange_buy]
-            ticker_sell = tickers[exchange_sell]
+        # Prix d'achat (ask) et de vente (bid) ; NaN si absent ou invalide
+        asks = np.array(
+            [tickers[e].get('ask') or tickers[e].get('last') or np.nan for e in exchange_ids],
+            dtype=float
+        )
+        bids = np.array(
+            [tickers[e].get('bid') or tickers[e].get('last') or np.nan for e in exchange_ids],
+            dtype=float
+        )
+        asks[~(asks > 0)] = np.nan
+        bids[~(bids > 0)] = np.nan
 
-            # Prix d'achat (ask) et de vente (bid)
-            price_buy = ticker_buy.get('ask') or ticker_buy.get('last') or 0
-            price_sell = ticker_sell.get('bid') or ticker_sell.get('last') or 0
+        # Volume 24h suffisant sur au moins un des deux exchanges de la paire
+        volume_ok = np.array(
+            [(tickers[e].get('quoteVolume') or 0) >= self.min_volume_24h for e in exchange_ids]
+        )
+        liquid = volume_ok[:, None] | volume_ok[None, :]
 
-            if not price_buy or not price_sell or price_buy <= 0 or price_sell <= 0:
-                continue
+        # Calcule le profit pour toutes les paires d'exchanges en une fois
+        profit = self._calculate_profit(symbol, exchange_ids, asks, bids)
 
-            # Calcule le profit potentiel
-            profit_data = self._calculate_profit(
-                symbol,
-                exchange_buy,
-                exchange_sell,
-                price_buy,
-                price_sell
-            )
+        # Paires (achat i, vente j) avec i < j, comme combinations(), liquides et profit net > 0
+        with np.errstate(invalid='ignore'):
+            profitable = np.triu((profit['net_profit_pct'] > 0) & liquid, k=1)
 
-            if profit_data['net_profit_pct'] > 0:
-                # Crée l'opportunité
-                opportunity = Opportunity(
-                    opportunity_type=OpportunityType.ARBITRAGE,
-                    symbol=symbol,
-                    strategy=self.get_name(),
-                    profit_potential=profit_data['net_profit_pct'],
-                    confidence=self._calculate_confidence(profit_data, ticker_buy, ticker_sell),
-                    data={
-                        'buy_exchange': exchange_buy,
-                        'sell_exchange': exchange_sell,
-                        'buy_price': price_buy,
-                        'sell_price': price_sell,
-                        'spread_pct': profit_data['spread_pct'],
-                        'total_fees_pct': profit_data['total_fees_pct'],
-                        'net_profit_pct': profit_data['net_profit_pct'],
-                    },
-                    metadata={
-                        'volume_24h_buy': ticker_buy.get('quoteVolume', 0),
-                        'volume_24h_sell': ticker_sell.get('quoteVolume', 0),
-                    }
-                )
-                opportunities.append(opportunity)
+        for i, j in np.argwhere(profitable):
+            exchange_buy = exchange_ids[i]
+            exchange_sell = exchange_ids[j]
+            ticker_buy = tickers[exchange_buy]
+            ticker_sell = tickers[exchange_sell]
 
-        return opportunities
+            profit_data = {
+                'spread_pct': float(profit['spread_pct'][i, j]),
+                'fee_buy_pct': float(profit['fee_pct'][i]),
+                'fee_sell_pct': float(profit['fee_pct'][j]),
+                'withdrawal_fee_pct': profit['withdrawal_fee_pct'],
+                'total_fees_pct': float(profit['total_fees_pct'][i, j]),
+                'net_profit_pct': float(profit['net_profit_pct'][i, j])
+            }
+
+            # Crée l'opportunité
+            yield Opportunity(
+                opportunity_type=OpportunityType.ARBITRAGE,
+                symbol=symbol,
+                strategy=self._name,
+                profit_potential=profit_data['net_profit_pct'],
+                confidence=self._calculate_confidence(profit_data, ticker_buy, ticker_sell),
+                data={
+                    'buy_exchange': exchange_buy,
+                    'sell_exchange': exchange_sell,
+                    'buy_price': float(asks[i]),
+                    'sell_price': float(bids[j]),
+                    'spread_pct': profit_data['spread_pct'],
+                    'total_fees_pct': profit_data['total_fees_pct'],
+                    'net_profit_pct': profit_data['net_profit_pct'],
+                },
+                metadata={
+                    'volume_24h_buy': ticker_buy.get('quoteVolume', 0),
+                    'volume_24h_sell': ticker_sell.get('quoteVolume', 0),
+                }
+            )
 
     def _calculate_profit(
         self,
         symbol: str,
-        exchange_buy: str,
-        exchange_sell: str,
-        price_buy: float,
-        price_sell: float
-    ) -> Dict[str, float]:
+        exchange_ids: List[str],
+        asks: np.ndarray,
+        bids: np.ndarray
+    ) -> Dict[str, Any]:
         """
-        Calcule le profit net après fees
+        Calcule le profit net après fees pour toutes les paires d'exchanges
+
+        Les matrices sont indexées [exchange d'achat, exchange de vente].
 
         Args:
             symbol: Symbole
-            exchange_buy: Exchange d'achat
-            exchange_sell: Exchange de vente
-            price_buy: Prix d'achat
-            price_sell: Prix de vente
+            exchange_ids: Exchanges, dans l'ordre des tableaux de prix
+            asks: Prix d'achat par exchange (NaN si indisponible)
+            bids: Prix de vente par exchange (NaN si indisponible)
 
         Returns:
-            Dict avec spread, fees, et profit net
+            Dict avec fees par exchange, et matrices de spread, fees et profit net
         """
         # Spread brut
-        spread_pct = ((price_sell - price_buy) / price_buy) * 100
+        spread_pct = ((bids[None, :] - asks[:, None]) / asks[:, None]) * 100
 
-        # Fees de trading
-        fee_buy = self.exchange_manager.get_trading_fee(exchange_buy, symbol)
-        fee_sell = self.exchange_manager.get_trading_fee(exchange_sell, symbol)
+        # Fees de trading (pré-calculés dans _scan_async)
+        fee_pct = np.array([self._fee_cache[(e, symbol)] for e in exchange_ids], dtype=float)
 
         # Fees de retrait (estimation conservative)
         withdrawal_fee_pct = 0.1 if self.include_withdrawal_fee else 0
 
-        total_fees_pct = fee_buy + fee_sell + withdrawal_fee_pct
+        total_fees_pct = fee_pct[:, None] + fee_pct[None, :] + withdrawal_fee_pct
 
         # Profit net
         net_profit_pct = spread_pct - total_fees_pct
 
         return {
             'spread_pct': spread_pct,
-            'fee_buy_pct': fee_buy,
-            'fee_sell_pct': fee_sell,
+            'fee_pct': fee_pct,
             'withdrawal_fee_pct': withdrawal_fee_pct,
             'total_fees_pct': total_fees_pct,
             'net_profit_pct': net_profit_pct
@@ -241,26 +320,16 @@ class CryptoArbitrageScanner(ScannerBase):
         """
         confidence = 50  # Base
 
-        # Bonus pour profit élevé
+        # Bonus pour profit élevé (bisect_left : seuils stricts)
         net_profit = profit_data['net_profit_pct']
-        if net_profit > 2:
-            confidence += 20
-        elif net_profit > 1:
-            confidence += 10
-        elif net_profit > 0.5:
-            confidence += 5
+        confidence += self._PROFIT_BONUS[bisect_left(self._PROFIT_THRESHOLDS, net_profit)]
 
         # Bonus pour volume élevé
         volume_buy = ticker_buy.get('quoteVolume', 0)
         volume_sell = ticker_sell.get('quoteVolume', 0)
         avg_volume = (volume_buy + volume_sell) / 2
 
-        if avg_volume > 10000000:  # >10M
-            confidence += 15
-        elif avg_volume > 5000000:  # >5M
-            confidence += 10
-        elif avg_volume > 1000000:  # >1M
-            confidence += 5
+        confidence += self._VOL_BONUS[bisect_left(self._VOL_THRESHOLDS, avg_volume)]
 
         # Pénalité si spread trop large (peut indiquer illiquidité)
         if profit_data['spread_pct'] > 5:
@@ -30,6 +30,20 @@ st.set_page_config(
 )
 
 
+@st.cache_resource
+def get_live_scanner() -> CryptoArbitrageScanner:
+    """
+    Scanner du scan en direct, partagé entre les reruns Streamlit
+
+    Conserve les marchés chargés, le plan symbole -> exchanges et le cache
+    de tickers d'un clic à l'autre au lieu de tout recréer à chaque scan.
+    """
+    return CryptoArbitrageScanner({
+        'min_profit': 0.3,
+        'min_confidence': 40
+    })
+
+
 class Dashboard:
     """Dashboard principal"""
 
@@ -100,10 +114,7 @@ class Dashboard:
         if scan_button:
             with st.spinner("Scan en cours des exchanges..."):
                 # Lance le scanner
-                scanner = CryptoArbitrageScanner({
-                    'min_profit': 0.3,
-                    'min_confidence': 40
-                })
+                scanner = get_live_scanner()
 
                 opportunities = scanner.run_scan()
 